@@ -92,3 +92,29 @@ def configure_mongodb():
     atlas_collection = get_mongodb_collection()
     create_vector_search_index(atlas_collection)
     return atlas_collection
+
+def get_query_log_collection(collection_name="gravidai_query_log"):
+    """
+    Estabelece uma conexão com a coleção do MongoDB Atlas usada pelo log de consultas.
+
+    Parâmetros
+    ----------
+    collection_name : str, opcional
+        O nome da coleção onde os registros serão armazenados (o padrão é "gravidai_query_log").
+
+    Retorna
+    -------
+    pymongo.collection.Collection
+        A coleção do log de consultas no MongoDB Atlas.
+
+    Exceções
+    --------
+    ValueError
+        Se a string de conexão com o MongoDB Atlas não estiver definida nas variáveis de ambiente.
+    """
+
+    if not ATLAS_CONNECTION_STRING:
+        raise ValueError("MongoDB Atlas connection string não está definida. Verifique seu arquivo .env.")
+
+    client = MongoClient(ATLAS_CONNECTION_STRING)
+    return client["mongodb_pdf_content"][collection_name]
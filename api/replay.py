@@ -0,0 +1,253 @@
+"""Responsável pelo replay do log de consultas contra a API"""
+
+import argparse
+import json
+import math
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+
+def load_records(source, limit=None):
+    """
+    Carrega os registros do log de consultas em ordem cronológica.
+
+    Parâmetros
+    ----------
+    source : str
+        Caminho do arquivo JSONL ou "mongodb" para ler a coleção do log de consultas.
+    limit : int, opcional
+        Quantidade máxima de registros carregados.
+
+    Retorna
+    -------
+    list
+        Lista de registros ordenados pelo campo 'timestamp' (instante de chegada da requisição).
+    """
+
+    if source == "mongodb":
+        from db.database import get_query_log_collection
+        cursor = get_query_log_collection().find({}, {"_id": 0}).sort("timestamp", 1)
+        if limit:
+            cursor = cursor.limit(limit)
+        return list(cursor)
+
+    records = []
+    with open(source, encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                records.append(json.loads(line))
+    records.sort(key=lambda record: datetime.fromisoformat(record["timestamp"]))
+    return records[:limit] if limit else records
+
+
+def build_schedule(records, speed=1.0, rate=None):
+    """
+    Calcula o instante de envio, em segundos a partir do início, de cada registro,
+    a partir dos instantes de chegada gravados no campo 'timestamp'.
+
+    Parâmetros
+    ----------
+    records : list
+        Registros do log de consultas em ordem cronológica.
+    speed : float, opcional
+        Fator de aceleração sobre os intervalos gravados (2.0 reproduz o tráfego com o dobro da taxa).
+    rate : float, opcional
+        Taxa fixa, em requisições por segundo, que substitui os intervalos gravados.
+
+    Retorna
+    -------
+    list
+        Lista de deslocamentos, em segundos, na mesma ordem dos registros.
+
+    Exceções
+    --------
+    ValueError
+        Se `speed` ou `rate` não forem maiores que zero.
+    """
+
+    if speed <= 0:
+        raise ValueError("O fator de aceleração (speed) deve ser maior que zero.")
+    if rate is not None and rate <= 0:
+        raise ValueError("A taxa (rate) deve ser maior que zero.")
+
+    if rate:
+        return [i / rate for i in range(len(records))]
+
+    if not records:
+        return []
+    first = datetime.fromisoformat(records[0]["timestamp"])
+    return [
+        (datetime.fromisoformat(record["timestamp"]) - first).total_seconds() / speed
+        for record in records
+    ]
+
+
+def send_question(url, question, timeout, scheduled_time):
+    """
+    Envia uma pergunta ao endpoint /ask_question e mede a latência.
+
+    A latência é medida a partir do instante agendado para o envio, e não do momento
+    em que uma thread do pool fica livre, para que a espera na fila do cliente
+    apareça nos percentis quando o serviço satura.
+
+    Parâmetros
+    ----------
+    url : str
+        URL base da API.
+    question : str
+        A pergunta a ser enviada.
+    timeout : float
+        Tempo limite, em segundos, da requisição.
+    scheduled_time : float
+        Instante agendado para o envio (segundos desde a época, como em `time.time()`).
+
+    Retorna
+    -------
+    dict
+        Status HTTP, latência a partir do agendamento, tempo de serviço observado
+        (a partir do envio efetivo), em segundos, e métricas retornadas pela API (quando houver).
+    """
+
+    request = urllib.request.Request(
+        url.rstrip("/") + "/ask_question",
+        data=json.dumps({"question": question}).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST"
+    )
+    start_time = time.time()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            body = json.loads(response.read())
+            status = response.status
+    except Exception as e:
+        end_time = time.time()
+        return {
+            "status": getattr(e, "code", None),
+            "latency": end_time - scheduled_time,
+            "service_time": end_time - start_time,
+            "metrics": None
+        }
+    end_time = time.time()
+    return {
+        "status": status,
+        "latency": end_time - scheduled_time,
+        "service_time": end_time - start_time,
+        "metrics": body.get("metrics")
+    }
+
+
+def percentile(values, fraction):
+    """Retorna o percentil `fraction` (entre 0 e 1) de uma lista de valores, pelo método nearest-rank."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def summarize(records, results, elapsed):
+    """
+    Resume o replay: vazão, latências, tokens e taxas de repetição que limitam
+    o acerto de um cache de respostas (mesma pergunta) ou de recuperação (mesmos fragmentos).
+
+    Retorna
+    -------
+    dict
+        Estatísticas agregadas do replay.
+    """
+
+    ok = [result for result in results if result["status"] == 200]
+    latencies = [result["latency"] for result in ok]
+    service_times = [result["service_time"] for result in ok]
+    tokens = [result["metrics"]["tokens_used"] for result in ok if result["metrics"]]
+    questions = [record["question"].strip().lower() for record in records]
+    chunk_sets = [tuple(sorted(record.get("chunk_ids", []))) for record in records]
+
+    return {
+        "requests": len(results),
+        "errors": len(results) - len(ok),
+        "elapsed": elapsed,
+        "throughput": len(results) / elapsed if elapsed else 0.0,
+        "latency_p50": percentile(latencies, 0.50),
+        "latency_p95": percentile(latencies, 0.95),
+        "latency_p99": percentile(latencies, 0.99),
+        "service_time_p50": percentile(service_times, 0.50),
+        "service_time_p95": percentile(service_times, 0.95),
+        "service_time_p99": percentile(service_times, 0.99),
+        "mean_tokens": sum(tokens) / len(tokens) if tokens else 0.0,
+        "repeated_questions": 1 - len(set(questions)) / len(questions) if questions else 0.0,
+        "repeated_chunk_sets": 1 - len(set(chunk_sets)) / len(chunk_sets) if chunk_sets else 0.0
+    }
+
+
+def replay(records, url, speed=1.0, rate=None, concurrency=32, timeout=60.0):
+    """
+    Reenvia o tráfego gravado à API respeitando os intervalos gravados (ou escalados).
+
+    Parâmetros
+    ----------
+    records : list
+        Registros do log de consultas em ordem cronológica.
+    url : str
+        URL base da API (por exemplo, http://127.0.0.1:8000).
+    speed : float, opcional
+        Fator de aceleração sobre os intervalos gravados.
+    rate : float, opcional
+        Taxa fixa, em requisições por segundo.
+    concurrency : int, opcional
+        Número máximo de requisições simultâneas.
+    timeout : float, opcional
+        Tempo limite, em segundos, de cada requisição.
+
+    Retorna
+    -------
+    dict
+        Estatísticas agregadas do replay.
+    """
+
+    schedule = build_schedule(records, speed=speed, rate=rate)
+    futures = []
+    start_time = time.time()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for record, offset in zip(records, schedule):
+            scheduled_time = start_time + offset
+            delay = scheduled_time - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            futures.append(executor.submit(send_question, url, record["question"], timeout, scheduled_time))
+        results = [future.result() for future in futures]
+
+    return summarize(records, results, time.time() - start_time)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Reenvia o log de consultas à API. Inicie a API com STUB_MODELS=true para não chamar a OpenAI."
+    )
+    parser.add_argument("--source", default="./logs/query_log.jsonl", help="Arquivo JSONL ou 'mongodb'.")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="URL base da API.")
+    parser.add_argument("--speed", type=float, default=1.0, help="Fator de aceleração dos intervalos gravados.")
+    parser.add_argument("--rate", type=float, default=None, help="Taxa fixa em requisições por segundo.")
+    parser.add_argument("--concurrency", type=int, default=32, help="Requisições simultâneas.")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Tempo limite de cada requisição.")
+    parser.add_argument("--limit", type=int, default=None, help="Quantidade máxima de registros.")
+    args = parser.parse_args()
+
+    if args.speed <= 0:
+        parser.error("--speed deve ser maior que zero.")
+    if args.rate is not None and args.rate <= 0:
+        parser.error("--rate deve ser maior que zero.")
+    if args.concurrency <= 0:
+        parser.error("--concurrency deve ser maior que zero.")
+
+    summary = replay(
+        load_records(args.source, limit=args.limit),
+        args.url,
+        speed=args.speed,
+        rate=args.rate,
+        concurrency=args.concurrency,
+        timeout=args.timeout
+    )
+    print(json.dumps(summary, indent=2))
@@ -8,29 +8,38 @@ from langchain.memory import ConversationBufferMemory
 from langchain_openai import OpenAIEmbeddings
 from langchain_community.vectorstores import MongoDBAtlasVectorSearch
 from langchain_community.chat_models import ChatOpenAI
-from utils.format import format_docs, format_chat_history, format_source
+from utils.format import format_docs, format_chat_history, format_source, format_chunk_ids
+from utils.query_log import log_query
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-atlas_collection = get_mongodb_collection()
-
-# Coleção existente no MongoDB Atlas
-vector_store = MongoDBAtlasVectorSearch(
-    collection=atlas_collection,
-    embedding=OpenAIEmbeddings(openai_api_key=OPENAI_API_KEY),
-    index_name="vector_index"
-)
-
-# Recuperador de vetores (retriever)
-retriever = vector_store.as_retriever(
-    search_type="similarity",
-    search_kwargs={'k': 5, 'fetch_k': 50}
-)
-
+STUB_MODELS = os.getenv("STUB_MODELS", "false").lower() == "true"
 OPENAI_MODEL = "gpt-3.5-turbo-0125"
-llm_model = ChatOpenAI(model=OPENAI_MODEL)
+
+if STUB_MODELS:
+    # Modelos simulados, sem MongoDB Atlas nem OpenAI, utilizados no replay de carga
+    from utils.stubs import create_stub_retriever, create_stub_llm
+    retriever = create_stub_retriever()
+    llm_model = create_stub_llm()
+else:
+    atlas_collection = get_mongodb_collection()
+
+    # Coleção existente no MongoDB Atlas
+    vector_store = MongoDBAtlasVectorSearch(
+        collection=atlas_collection,
+        embedding=OpenAIEmbeddings(openai_api_key=OPENAI_API_KEY),
+        index_name="vector_index"
+    )
+
+    # Recuperador de vetores (retriever)
+    retriever = vector_store.as_retriever(
+        search_type="similarity",
+        search_kwargs={'k': 5, 'fetch_k': 50}
+    )
+
+    llm_model = ChatOpenAI(model=OPENAI_MODEL)
 
 # Memória com a chave 'history'
 memory = ConversationBufferMemory(memory_key="history", return_messages=True)
@@ -46,12 +55,33 @@ def ask_question(question: str):
     """
     Processa uma pergunta utilizando um modelo de linguagem e retorna a 
     resposta juntamente com o histórico da conversa.
+
+    Toda pergunta é registrada no log de consultas, inclusive as que falharem.
     """
     start_time = time.time()
+    record = {"chunk_ids": [], "timings": {}, "tokens": {}, "error": None}
+
+    try:
+        return _answer_question(question, start_time, record)
+    except Exception as e:
+        record["error"] = str(e)
+        raise
+    finally:
+        record["timings"]["total"] = time.time() - start_time
+        log_query(question=question, start_time=start_time, **record)
+
+def _answer_question(question: str, start_time: float, record: dict):
+    """
+    Executa a recuperação, a geração e a contagem de tokens, preenchendo
+    `record` com os fragmentos recuperados, os tempos de cada etapa e os tokens.
+    """
 
     # Traz os documentos relevantes
     docs = retriever.invoke(question)
     context = format_docs(docs)
+    retrieval_time = time.time()
+    record["chunk_ids"] = format_chunk_ids(docs)
+    record["timings"]["retrieval"] = retrieval_time - start_time
 
     template = """
     You are an expert in health and pregnancy, with in-depth knowledge of obstetrics, nutrition, exercise for pregnant women, fetal development and postnatal development. 
@@ -81,10 +111,13 @@ def ask_question(question: str):
 
     prompt = template.format(context=context, question=question)
     answer = conversation_chain.run(prompt)
+    generation_time = time.time()
+    record["timings"]["generation"] = generation_time - retrieval_time
     chat_history = format_chat_history(conversation_chain.memory.chat_memory.messages, docs)
     source = format_source(docs)
 
     end_time = time.time()
+    record["timings"]["formatting"] = end_time - generation_time
     response_time = end_time - start_time
     encoding = encoding_for_model(OPENAI_MODEL)
     prompt_tokens = len(encoding.encode(prompt))
@@ -95,5 +128,11 @@ def ask_question(question: str):
         "tokens_used": tokens_used,
         "response_time": response_time
     }
+    record["timings"]["tokenization"] = time.time() - end_time
+    record["tokens"] = {
+        "prompt": prompt_tokens,
+        "response": response_tokens,
+        "total": tokens_used
+    }
 
     return answer, chat_history, prompt, source, metrics
@@ -0,0 +1,42 @@
+"""Configuração dos testes"""
+
+import os
+
+# Evita que o escritor global do log de consultas grave em ./logs durante os testes
+os.environ["QUERY_LOG_BACKEND"] = "none"
+
+import pytest
+from utils import query_log
+from utils.query_log import QueryLogWriter
+
+
+class ListSink:
+    """Destino em memória que guarda cada lote gravado."""
+
+    def __init__(self):
+        self.batches = []
+
+    def write(self, records):
+        self.batches.append(list(records))
+
+    @property
+    def records(self):
+        return [record for batch in self.batches for record in batch]
+
+
+@pytest.fixture
+def logged_records(monkeypatch):
+    """
+    Substitui o escritor global do log de consultas por um em memória.
+    Retorna uma função que encerra o escritor e devolve os registros gravados.
+    """
+
+    sink = ListSink()
+    writer = QueryLogWriter(sink, flush_interval=0.05)
+    monkeypatch.setattr(query_log, "writer", writer)
+
+    def close():
+        writer.close()
+        return sink.records
+
+    return close
@@ -0,0 +1,64 @@
+"""Testes do registro de consultas no serviço de respostas"""
+
+import importlib
+import sys
+import pytest
+from utils.stubs import STUB_ANSWER
+
+
+class WhitespaceEncoding:
+    """Codificação simplificada (um token por palavra), sem baixar o vocabulário do tiktoken."""
+
+    def encode(self, text):
+        return text.split()
+
+
+class FailingRetriever:
+    """Recuperador que sempre falha."""
+
+    def invoke(self, question):
+        raise RuntimeError("busca indisponível")
+
+
+@pytest.fixture
+def answer_service(monkeypatch):
+    monkeypatch.setenv("STUB_MODELS", "true")
+    sys.modules.pop("service.answer_service", None)
+    module = importlib.import_module("service.answer_service")
+    monkeypatch.setattr(module, "encoding_for_model", lambda model: WhitespaceEncoding())
+    yield module
+    sys.modules.pop("service.answer_service", None)
+
+
+def test_ask_question_logs_chunks_timings_and_tokens(answer_service, logged_records, monkeypatch):
+    monkeypatch.setattr(answer_service.llm_model, "latency", 0.1)
+
+    answer, _, prompt, _, metrics = answer_service.ask_question("Posso tomar café?")
+    record = logged_records()[0]
+
+    assert answer == STUB_ANSWER
+    assert record["question"] == "Posso tomar café?"
+    assert record["chunk_ids"] == [f"stub-{i}" for i in range(5)]
+    assert record["error"] is None
+    assert set(record["timings"]) == {"retrieval", "generation", "formatting", "tokenization", "total"}
+    assert record["timings"]["generation"] >= 0.1
+    assert record["timings"]["total"] >= record["timings"]["generation"]
+    assert record["tokens"] == {
+        "prompt": len(prompt.split()),
+        "response": len(STUB_ANSWER.split()),
+        "total": metrics["tokens_used"]
+    }
+
+
+def test_ask_question_logs_failed_request_and_reraises(answer_service, logged_records, monkeypatch):
+    monkeypatch.setattr(answer_service, "retriever", FailingRetriever())
+
+    with pytest.raises(RuntimeError, match="busca indisponível"):
+        answer_service.ask_question("Posso tomar café?")
+    record = logged_records()[0]
+
+    assert record["question"] == "Posso tomar café?"
+    assert record["error"] == "busca indisponível"
+    assert record["chunk_ids"] == []
+    assert record["tokens"] == {}
+    assert set(record["timings"]) == {"total"}
@@ -0,0 +1,103 @@
+"""Testes do log de consultas"""
+
+import threading
+from datetime import datetime, timezone
+from conftest import ListSink
+from utils import query_log
+from utils.query_log import QueryLogWriter
+
+
+class BlockingSink(ListSink):
+    """Destino que bloqueia a gravação até que `release` seja sinalizado."""
+
+    def __init__(self):
+        super().__init__()
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def write(self, records):
+        self.entered.set()
+        self.release.wait(timeout=5)
+        super().write(records)
+
+
+class FailingSink:
+    """Destino que sempre falha."""
+
+    def write(self, records):
+        raise RuntimeError("falha simulada")
+
+
+def test_writer_flushes_pending_records_on_close():
+    sink = ListSink()
+    writer = QueryLogWriter(sink, batch_size=2, flush_interval=0.05)
+    for i in range(5):
+        writer.submit({"question": f"q{i}"})
+    writer.close()
+
+    assert [record["question"] for record in sink.records] == [f"q{i}" for i in range(5)]
+    assert all(len(batch) <= 2 for batch in sink.batches)
+    assert writer.dropped == 0
+
+
+def test_writer_drops_records_when_queue_is_full():
+    sink = BlockingSink()
+    writer = QueryLogWriter(sink, batch_size=1, flush_interval=0.05, max_queue=1)
+    writer.submit({"question": "q0"})
+    assert sink.entered.wait(timeout=5)
+
+    writer.submit({"question": "q1"})
+    writer.submit({"question": "q2"})
+    sink.release.set()
+    writer.close()
+
+    assert [record["question"] for record in sink.records] == ["q0", "q1"]
+    assert writer.dropped == 1
+
+
+def test_writer_counts_records_lost_when_sink_fails():
+    writer = QueryLogWriter(FailingSink(), batch_size=10, flush_interval=0.05)
+    for i in range(3):
+        writer.submit({"question": f"q{i}"})
+    writer.close()
+
+    assert writer.dropped == 3
+
+
+def test_writer_counts_drops_from_concurrent_threads():
+    sink = BlockingSink()
+    writer = QueryLogWriter(sink, batch_size=1, flush_interval=0.05, max_queue=1)
+    writer.submit({"question": "q0"})
+    assert sink.entered.wait(timeout=5)
+    writer.submit({"question": "q1"})
+
+    def submit_many():
+        for i in range(1000):
+            writer.submit({"question": f"excedente {i}"})
+
+    threads = [threading.Thread(target=submit_many) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    sink.release.set()
+    writer.close()
+
+    assert writer.dropped == 8000
+
+
+def test_log_query_records_arrival_time_and_error(logged_records):
+    start_time = 1700000000.0
+
+    query_log.log_query(
+        question="Posso tomar café?",
+        start_time=start_time,
+        chunk_ids=["a"],
+        timings={"total": 3.5},
+        tokens={},
+        error="timeout"
+    )
+    record = logged_records()[0]
+    assert record["timestamp"] == "2023-11-14T22:13:20+00:00"
+    assert datetime.fromisoformat(record["timestamp"]) == datetime.fromtimestamp(start_time, tz=timezone.utc)
+    assert record["error"] == "timeout"
@@ -0,0 +1,85 @@
+"""Testes do replay do log de consultas"""
+
+import json
+import time
+import pytest
+import replay
+
+
+def make_record(timestamp, question="q", chunk_ids=None):
+    return {"timestamp": timestamp, "question": question, "chunk_ids": chunk_ids or []}
+
+
+def test_load_records_orders_by_arrival_time(tmp_path):
+    path = tmp_path / "query_log.jsonl"
+    records = [
+        make_record("2024-11-21T12:00:02+00:00", "segunda"),
+        make_record("2024-11-21T12:00:00+00:00", "primeira"),
+    ]
+    path.write_text("".join(json.dumps(record) + "\n" for record in records), encoding="utf-8")
+
+    assert [record["question"] for record in replay.load_records(str(path))] == ["primeira", "segunda"]
+
+
+def test_build_schedule_scales_recorded_intervals():
+    records = [
+        make_record("2024-11-21T12:00:00+00:00"),
+        make_record("2024-11-21T12:00:01+00:00"),
+        make_record("2024-11-21T12:00:05+00:00"),
+    ]
+
+    assert replay.build_schedule(records) == [0.0, 1.0, 5.0]
+    assert replay.build_schedule(records, speed=2.0) == [0.0, 0.5, 2.5]
+    assert replay.build_schedule(records, rate=4.0) == [0.0, 0.25, 0.5]
+
+
+@pytest.mark.parametrize("kwargs", [{"speed": 0}, {"speed": -1.0}, {"rate": 0}, {"rate": -2.0}])
+def test_build_schedule_rejects_non_positive_speed_or_rate(kwargs):
+    with pytest.raises(ValueError):
+        replay.build_schedule([make_record("2024-11-21T12:00:00+00:00")], **kwargs)
+
+
+def test_percentile_uses_nearest_rank():
+    assert replay.percentile([1.0, 2.0], 0.50) == 1.0
+    assert replay.percentile(list(range(1, 101)), 0.99) == 99
+    assert replay.percentile(list(range(1, 101)), 1.0) == 100
+    assert replay.percentile([], 0.95) == 0.0
+
+
+def test_send_question_measures_latency_from_scheduled_time(monkeypatch):
+    def refuse(request, timeout):
+        raise OSError("conexão recusada")
+
+    monkeypatch.setattr(replay.urllib.request, "urlopen", refuse)
+    result = replay.send_question("http://127.0.0.1:1", "q", timeout=1.0, scheduled_time=time.time() - 5)
+
+    assert result["status"] is None
+    assert result["latency"] >= 5
+    assert result["service_time"] < 5
+
+
+def test_summarize_reports_errors_latencies_and_repetition():
+    records = [
+        make_record("2024-11-21T12:00:00+00:00", "Posso tomar café?", ["a", "b"]),
+        make_record("2024-11-21T12:00:01+00:00", "posso tomar café? ", ["b", "a"]),
+        make_record("2024-11-21T12:00:02+00:00", "Quando fazer o pré-natal?", ["c"]),
+        make_record("2024-11-21T12:00:03+00:00", "Quais vacinas tomar?", ["d"]),
+    ]
+    results = [
+        {"status": 200, "latency": 1.0, "service_time": 0.5, "metrics": {"tokens_used": 100}},
+        {"status": 200, "latency": 2.0, "service_time": 1.0, "metrics": {"tokens_used": 300}},
+        {"status": 200, "latency": 4.0, "service_time": 1.5, "metrics": {"tokens_used": 200}},
+        {"status": 500, "latency": 9.0, "service_time": 9.0, "metrics": None},
+    ]
+
+    summary = replay.summarize(records, results, elapsed=2.0)
+
+    assert summary["requests"] == 4
+    assert summary["errors"] == 1
+    assert summary["throughput"] == 2.0
+    assert summary["latency_p50"] == 2.0
+    assert summary["latency_p99"] == 4.0
+    assert summary["service_time_p50"] == 1.0
+    assert summary["mean_tokens"] == 200.0
+    assert summary["repeated_questions"] == 0.25
+    assert summary["repeated_chunk_sets"] == 0.25
@@ -0,0 +1,20 @@
+"""Testes dos modelos simulados"""
+
+import time
+from utils.stubs import STUB_ANSWER, StubChatModel, create_stub_retriever
+
+
+def test_stub_chat_model_waits_configured_latency():
+    model = StubChatModel(latency=0.2)
+
+    start_time = time.time()
+    message = model.invoke("Posso tomar café?")
+
+    assert time.time() - start_time >= 0.2
+    assert message.content == STUB_ANSWER
+
+
+def test_stub_retriever_returns_identified_chunks():
+    docs = create_stub_retriever(k=3).invoke("Posso tomar café?")
+
+    assert [doc.metadata["_id"] for doc in docs] == ["stub-0", "stub-1", "stub-2"]
@@ -79,3 +79,27 @@ def format_docs(docs):
     """
 
     return "\n\n".join(doc.page_content for doc in docs)
+
+def format_chunk_ids(docs):
+    """
+    Extrai os identificadores dos fragmentos recuperados na busca vetorial.
+
+    Parâmetros
+    ----------
+    docs : list
+        Lista de documentos contendo metadados, incluindo '_id', 'source' e 'page'.
+
+    Retorna
+    -------
+    list
+        Lista de identificadores em texto. Quando o documento não possui '_id',
+        utiliza-se a combinação 'source:page'.
+    """
+
+    result = []
+    for doc in docs:
+        chunk_id = doc.metadata.get('_id')
+        if chunk_id is None:
+            chunk_id = f"{doc.metadata.get('source', 'Desconhecido')}:{doc.metadata.get('page', 'Desconhecido')}"
+        result.append(str(chunk_id))
+    return result
@@ -0,0 +1,196 @@
+"""Responsável pelo log de consultas (captura para replay e planejamento de capacidade)"""
+
+import atexit
+import json
+import os
+import queue
+import threading
+from datetime import datetime, timezone
+from dotenv import load_dotenv
+
+load_dotenv()
+QUERY_LOG_BACKEND = os.getenv("QUERY_LOG_BACKEND", "jsonl").lower()
+QUERY_LOG_PATH = os.getenv("QUERY_LOG_PATH", "./logs/query_log.jsonl")
+QUERY_LOG_BATCH_SIZE = int(os.getenv("QUERY_LOG_BATCH_SIZE", "50"))
+QUERY_LOG_FLUSH_INTERVAL = float(os.getenv("QUERY_LOG_FLUSH_INTERVAL", "2.0"))
+QUERY_LOG_MAX_QUEUE = int(os.getenv("QUERY_LOG_MAX_QUEUE", "10000"))
+
+
+class JsonlSink:
+    """
+    Destino append-only em arquivo JSONL local, um registro por linha.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def write(self, records):
+        lines = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write(lines)
+
+
+class MongoSink:
+    """
+    Destino em uma coleção do MongoDB Atlas.
+    """
+
+    def __init__(self):
+        from db.database import get_query_log_collection
+        self.collection = get_query_log_collection()
+
+    def write(self, records):
+        # insert_many adiciona o campo _id nos dicionários, por isso enviamos cópias
+        self.collection.insert_many([dict(record) for record in records], ordered=False)
+
+
+class QueryLogWriter:
+    """
+    Escritor assíncrono e bufferizado do log de consultas.
+
+    Os registros são colocados em uma fila em memória e gravados em lote por uma
+    thread em segundo plano, de modo que a requisição nunca espera pelo I/O.
+    Se a fila estiver cheia, o registro é descartado e contabilizado em `dropped`.
+
+    Parâmetros
+    ----------
+    sink : JsonlSink | MongoSink
+        O destino dos registros.
+    batch_size : int, opcional
+        Quantidade máxima de registros gravados por lote.
+    flush_interval : float, opcional
+        Tempo máximo, em segundos, que um registro aguarda na fila antes de ser gravado.
+    max_queue : int, opcional
+        Tamanho máximo da fila em memória.
+    """
+
+    def __init__(self, sink, batch_size=50, flush_interval=2.0, max_queue=10000):
+        self.sink = sink
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="query-log-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, record):
+        """
+        Enfileira um registro sem bloquear a requisição.
+        """
+
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self._count_dropped(1)
+
+    def close(self):
+        """
+        Encerra a thread de escrita após gravar os registros pendentes.
+        """
+
+        self._stop.set()
+        self._thread.join()
+
+    def _count_dropped(self, count):
+        # `submit` roda na thread da requisição e `_run` na thread de escrita
+        with self._dropped_lock:
+            self.dropped += count
+
+    def _run(self):
+        while not (self._stop.is_set() and self._queue.empty()):
+            batch = []
+            try:
+                batch.append(self._queue.get(timeout=self.flush_interval))
+                while len(batch) < self.batch_size:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+
+            if batch:
+                try:
+                    self.sink.write(batch)
+                except Exception as e:
+                    self._count_dropped(len(batch))
+                    print(f"Erro ao gravar o log de consultas: {str(e)}")
+
+
+def create_writer(backend=QUERY_LOG_BACKEND, path=QUERY_LOG_PATH):
+    """
+    Cria o escritor do log de consultas de acordo com o backend configurado.
+
+    Parâmetros
+    ----------
+    backend : str, opcional
+        "jsonl" (arquivo local), "mongodb" (coleção no MongoDB Atlas) ou "none" (desativado).
+    path : str, opcional
+        Caminho do arquivo JSONL, utilizado apenas pelo backend "jsonl".
+
+    Retorna
+    -------
+    QueryLogWriter | None
+        O escritor configurado, ou None se o log estiver desativado.
+
+    Exceções
+    --------
+    ValueError
+        Se o backend informado não for suportado.
+    """
+
+    if backend in ("", "none"):
+        return None
+    if backend == "jsonl":
+        sink = JsonlSink(path)
+    elif backend == "mongodb":
+        sink = MongoSink()
+    else:
+        raise ValueError(f"Backend de log de consultas não suportado: {backend}")
+
+    writer = QueryLogWriter(
+        sink,
+        batch_size=QUERY_LOG_BATCH_SIZE,
+        flush_interval=QUERY_LOG_FLUSH_INTERVAL,
+        max_queue=QUERY_LOG_MAX_QUEUE
+    )
+    atexit.register(writer.close)
+    return writer
+
+
+writer = create_writer()
+
+def log_query(question, start_time, chunk_ids, timings, tokens, error=None):
+    """
+    Registra uma consulta no log de consultas.
+
+    Parâmetros
+    ----------
+    question : str
+        A pergunta enviada pelo usuário.
+    start_time : float
+        Instante de chegada da requisição (segundos desde a época, como em `time.time()`).
+        É gravado em UTC no campo 'timestamp' e define o agendamento do replay.
+    chunk_ids : list
+        Identificadores dos fragmentos recuperados na busca vetorial.
+    timings : dict
+        Tempo, em segundos, de cada etapa do processamento.
+    tokens : dict
+        Contagem de tokens do prompt, da resposta e total.
+    error : str, opcional
+        Mensagem de erro, quando o processamento da pergunta falhou.
+    """
+
+    if writer is None:
+        return
+
+    writer.submit({
+        "timestamp": datetime.fromtimestamp(start_time, tz=timezone.utc).isoformat(),
+        "question": question,
+        "chunk_ids": chunk_ids,
+        "timings": timings,
+        "tokens": tokens,
+        "error": error
+    })
@@ -0,0 +1,98 @@
+"""Responsável pelos modelos simulados (stubs) utilizados no replay de carga"""
+
+import os
+import time
+from typing import Any, List, Optional
+from dotenv import load_dotenv
+from langchain_core.callbacks import CallbackManagerForLLMRun, CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.language_models.chat_models import SimpleChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.retrievers import BaseRetriever
+
+load_dotenv()
+STUB_RETRIEVAL_LATENCY = float(os.getenv("STUB_RETRIEVAL_LATENCY", "0.0"))
+STUB_LLM_LATENCY = float(os.getenv("STUB_LLM_LATENCY", "0.0"))
+
+STUB_ANSWER = (
+    "Durante a gestação, é importante manter uma alimentação saudável e diversificada. "
+    "Esta é uma resposta simulada, gerada sem chamadas à OpenAI."
+)
+
+
+class StubRetriever(BaseRetriever):
+    """
+    Recuperador simulado que devolve sempre os mesmos documentos após uma latência fixa,
+    sem acessar o MongoDB Atlas nem gerar embeddings.
+    """
+
+    documents: List[Document]
+    latency: float = 0.0
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        if self.latency:
+            time.sleep(self.latency)
+        return self.documents
+
+
+class StubChatModel(SimpleChatModel):
+    """
+    Modelo de linguagem simulado que devolve sempre a mesma resposta após uma latência fixa,
+    sem chamar a OpenAI.
+    """
+
+    response: str = STUB_ANSWER
+    latency: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub-chat-model"
+
+    def _call(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> str:
+        if self.latency:
+            time.sleep(self.latency)
+        return self.response
+
+
+def create_stub_retriever(k=5):
+    """
+    Cria um recuperador simulado com `k` fragmentos fictícios.
+
+    Parâmetros
+    ----------
+    k : int, opcional
+        Quantidade de fragmentos retornados a cada busca (o padrão é 5, igual ao recuperador real).
+
+    Retorna
+    -------
+    StubRetriever
+        O recuperador simulado.
+    """
+
+    documents = [
+        Document(
+            page_content=f"Fragmento simulado {i} sobre cuidados durante a gestação.",
+            metadata={"_id": f"stub-{i}", "source": "./data/stub.pdf", "page": i}
+        )
+        for i in range(k)
+    ]
+    return StubRetriever(documents=documents, latency=STUB_RETRIEVAL_LATENCY)
+
+
+def create_stub_llm():
+    """
+    Cria um modelo de linguagem simulado que responde um texto fixo após uma latência fixa.
+
+    Retorna
+    -------
+    StubChatModel
+        O modelo de linguagem simulado.
+    """
+
+    return StubChatModel(latency=STUB_LLM_LATENCY)